@@ -1,31 +1,52 @@
 # climatechic_mvp_poc.py
 # Fixed for Windows compatibility
 
-import geopandas as gpd
-import pandas as pd
-import folium
-from folium import plugins
+# pyproj and folium are imported inside the functions that need them,
+# so each CLI mode only pays for its own imports
+import numpy as np
+import shapely
 from shapely.geometry import Polygon, shape
+import orjson
 import json
 import random
 import os
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
 
 print("🚀 Starting ClimateChic MVP Simulation (Local Machine)")
 
 # ==============================================
 # 1. SIMULATE DATA STORAGE
 # ==============================================
+@dataclass(slots=True, frozen=True)
+class Flora:
+    """A recommended plant species and its benefit to the flock."""
+    name: str
+    type: str
+    chicken_benefit: str
+
+# Tuples: the per-region entries are shared by every plan, so keep them immutable
 FLORA_DATABASE = {
-    "Tropical_Rainforest": [
-        {"name": "Leucaena leucocephala", "type": "Tree", "chicken_benefit": "High-protein forage, shade"},
-        {"name": "Moringa oleifera", "type": "Tree", "chicken_benefit": "Vitamins, minerals, forage"},
-        {"name": "Paspalum notatum", "type": "Grass", "chicken_benefit": "Ground cover, forage"},
-    ],
-    "Tropical_Savanna": [
-        {"name": "Acacia tortilis", "type": "Tree", "chicken_benefit": "Shade, pods for forage"},
-        {"name": "Cenchrus ciliaris", "type": "Grass", "chicken_benefit": "Drought-resistant forage"},
-    ]
+    "Tropical_Rainforest": (
+        Flora("Leucaena leucocephala", "Tree", "High-protein forage, shade"),
+        Flora("Moringa oleifera", "Tree", "Vitamins, minerals, forage"),
+        Flora("Paspalum notatum", "Grass", "Ground cover, forage"),
+    ),
+    "Tropical_Savanna": (
+        Flora("Acacia tortilis", "Tree", "Shade, pods for forage"),
+        Flora("Cenchrus ciliaris", "Grass", "Drought-resistant forage"),
+    )
+}
+
+# Report lines per region, built once since the flora table is static
+_FLORA_LINES = {
+    region: "".join(
+        f"* {flora.name} ({flora.type}) - {flora.chicken_benefit}\n"
+        for flora in floras
+    )
+    for region, floras in FLORA_DATABASE.items()
 }
 
 # Create biogeographic regions
@@ -36,91 +57,248 @@ dummy_regions_data = {
         Polygon([(36.0, -2.0), (38.0, -2.0), (38.0, 0.5), (36.0, 0.5), (36.0, -2.0)])
     ]
 }
-BIOGEO_REGIONS_GDF = gpd.GeoDataFrame(dummy_regions_data, crs="EPSG:4326")
+# Plain shapely arrays (EPSG:4326) so importing doesn't require geopandas
+BIOGEO_REGION_NAMES = np.array(dummy_regions_data['name'])
+BIOGEO_REGION_GEOMS = np.array(dummy_regions_data['geometry'])
+# Regions are static, so build their prepared (indexed-edge) form once
+shapely.prepare(BIOGEO_REGION_GEOMS)
+
+# (minx, miny, maxx, maxy) covering every region
+REGIONS_EXTENT = tuple(shapely.total_bounds(BIOGEO_REGION_GEOMS).tolist())
+
+# Up to this many regions, testing every prepared region directly is at
+# least as fast as the tree query (measured crossover with shapely 2.2);
+# the lookup strategy is fixed at import from the table size
+DIRECT_QUERY_MAX_REGIONS = 64
+_DIRECT_REGION_QUERY = len(BIOGEO_REGION_GEOMS) <= DIRECT_QUERY_MAX_REGIONS
+
+# Spatial index over the regions, only needed for larger tables
+REGION_TREE = None if _DIRECT_REGION_QUERY else shapely.STRtree(BIOGEO_REGION_GEOMS)
+
+# Equal-area projection (World Cylindrical Equal Area) for area in m²
+AREA_CRS = "EPSG:6933"
+
+# Per-hectare projections: trees (year 5), chickens (year 2), BSF kg/week
+PROJECTION_RATES = np.array([100.0, 50.0, 2.0])
+
+# Geometries per partial union when dissolving large boundaries
+UNION_CHUNK_SIZE = 200
+
+# Drawing tool: pre-rendered folium page with {{ lat }}/{{ lon }} placeholders
+DRAWING_TOOL_TEMPLATE = Path(__file__).with_name('climatechic_drawing_tool_template.html')
+DEFAULT_LOCATION = (-1.225, 36.775)
+_TEMPLATE_SENTINEL = (-12.3456789, 65.4321987)
 
 # ==============================================
 # 2. CORE GEOAI FUNCTIONS (REUSABLE)
 # ==============================================
 
-def analyze_land(boundary_gdf):
-    """Analyze land and generate restoration plan."""
-    plan = {}
-    # FIXED: Use union_all() instead of deprecated unary_union
-    boundary_geom = boundary_gdf.geometry.union_all()
-    
-    # Region analysis
-    intersected_region = None
-    max_overlap = 0
-    for idx, region in BIOGEO_REGIONS_GDF.iterrows():
-        if boundary_geom.intersects(region.geometry):
-            overlap_area = boundary_geom.intersection(region.geometry).area
-            overlap_percentage = (overlap_area / boundary_geom.area) * 100
-            if overlap_percentage > max_overlap:
-                max_overlap = overlap_percentage
-                intersected_region = region['name']
+def union_geometries(geoms):
+    """Dissolve geometries into one, skipping the union for a single polygon."""
+    n = len(geoms)
+    if n == 1:
+        return geoms[0]
+    if n <= UNION_CHUNK_SIZE:
+        return shapely.union_all(geoms)
+    # Union in chunks first; GEOS handles many small unions faster
+    return shapely.union_all([
+        shapely.union_all(geoms[i:i + UNION_CHUNK_SIZE])
+        for i in range(0, n, UNION_CHUNK_SIZE)
+    ])
+
+@lru_cache(maxsize=None)
+def _area_transformer():
+    """Lon/lat to AREA_CRS transformer, created on first use."""
+    from pyproj import Transformer
     
+    return Transformer.from_crs("EPSG:4326", AREA_CRS, always_xy=True)
+
+def equal_area_hectares(geoms):
+    """Area in hectares of lon/lat geometries (scalar or array), via AREA_CRS."""
+    transformer = _area_transformer()
+    projected = shapely.transform(
+        geoms, lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])))
+    return shapely.area(projected) / 10_000.0
+
+def project_outputs(area_hectares):
+    """Trees, chickens and BSF kg/week for one area or an array of areas."""
+    # astype truncates toward zero, like the int() calls it replaces
+    return np.multiply.outer(area_hectares, PROJECTION_RATES).astype(np.int64)
+
+def build_plan(intersected_region, max_overlap, area_hectares, projections):
+    """Assemble the restoration plan for one analyzed boundary."""
+    trees, chickens, bsf_kg = projections.tolist()
+    plan = {}
     region_key = intersected_region.split('_Region')[0] if intersected_region else "Tropical_Savanna"
     plan['biogeographic_region'] = region_key
-    plan['recommended_flora'] = FLORA_DATABASE.get(region_key, [])
+    plan['recommended_flora'] = FLORA_DATABASE.get(region_key, ())
     
-    # Simulation
-    area_hectares = boundary_geom.area * 10000
     plan['simulation'] = {
         'land_area_hectares': round(area_hectares, 2),
-        'estimated_trees_year_5': int(area_hectares * 100),
-        'estimated_chickens_year_2': int(area_hectares * 50),
-        'black_soldier_fly_production_kg_week': int(area_hectares * 2),
+        'estimated_trees_year_5': trees,
+        'estimated_chickens_year_2': chickens,
+        'black_soldier_fly_production_kg_week': bsf_kg,
         'region_overlap_percentage': round(max_overlap, 1)
     }
     
     return plan
 
-def generate_plan_report(plan):
-    """Generate restoration plan report."""
-    # FIXED: Remove emojis for Windows compatibility
-    report = f"""CLIMATECHIC RESTORATION PLAN
+def candidate_regions(boundary_geom):
+    """Indices, in table order, of the regions intersecting the boundary."""
+    if _DIRECT_REGION_QUERY:
+        # One vectorized predicate over the prepared regions
+        return np.flatnonzero(shapely.intersects(BIOGEO_REGION_GEOMS, boundary_geom))
+    # Prepared geometry speeds up the tree's intersects predicate
+    shapely.prepare(boundary_geom)
+    # Sorted so ties resolve to the first region in table order
+    return np.sort(REGION_TREE.query(boundary_geom, predicate='intersects'))
+
+def analyze_land(boundary_geom):
+    """Analyze a lon/lat boundary geometry and generate restoration plan."""
+    bgeom_area = boundary_geom.area
+    if not bgeom_area > 0:
+        raise ValueError(
+            f"Boundary has no area ({boundary_geom.geom_type}); "
+            "draw a closed polygon with at least three corners")
+    
+    # Region analysis: find intersecting regions (direct test or R-tree,
+    # see candidate_regions), then one GEOS loop over those candidates
+    intersected_region = None
+    max_overlap = 0
+    # Boundaries outside the extent of the whole region table skip GEOS
+    minx, miny, maxx, maxy = boundary_geom.bounds
+    rminx, rminy, rmaxx, rmaxy = REGIONS_EXTENT
+    if not (rmaxx < minx or rminx > maxx or rmaxy < miny or rminy > maxy):
+        candidates = candidate_regions(boundary_geom)
+        if len(candidates):
+            regions = BIOGEO_REGION_GEOMS[candidates]
+            inter_areas = shapely.area(shapely.intersection(boundary_geom, regions))
+            overlap_pcts = inter_areas / bgeom_area * 100
+            idx = int(np.argmax(overlap_pcts))
+            # A region that is only touched keeps the int 0 / no-region result
+            if overlap_pcts[idx] > 0:
+                max_overlap = float(overlap_pcts[idx])
+                intersected_region = BIOGEO_REGION_NAMES[candidates[idx]]
+    
+    # Simulation: overlap is measured in lon/lat, area in an equal-area CRS
+    area_hectares = float(equal_area_hectares(boundary_geom))
+    
+    return build_plan(intersected_region, max_overlap, area_hectares,
+                      project_outputs(area_hectares))
+
+def analyze_land_batch(boundaries):
+    """Analyze each lon/lat boundary separately; returns one plan per boundary."""
+    boundaries = np.asarray(boundaries)
+    n = len(boundaries)
+    if n == 0:
+        return []
+    
+    # All (region, boundary) intersecting pairs in one tree query
+    tree = shapely.STRtree(boundaries)
+    region_idx, boundary_idx = tree.query(BIOGEO_REGION_GEOMS, predicate='intersects')
+    inter_areas = shapely.area(shapely.intersection(
+        boundaries[boundary_idx], BIOGEO_REGION_GEOMS[region_idx]))
+    # Zero-area (degenerate) boundaries get 0% overlap instead of NaN
+    pair_areas = shapely.area(boundaries)[boundary_idx]
+    overlap_pcts = np.divide(inter_areas, pair_areas, out=np.zeros_like(inter_areas),
+                             where=pair_areas > 0) * 100
+    
+    # Winner per boundary: sort by boundary, then overlap (desc), then
+    # region order for ties, and keep the first pair of each group
+    order = np.lexsort((region_idx, -overlap_pcts, boundary_idx))
+    grouped = boundary_idx[order]
+    winners = order[np.r_[True, grouped[1:] != grouped[:-1]]] if len(order) else order
+    max_overlaps = np.zeros(n)
+    best_regions = np.full(n, -1)
+    max_overlaps[boundary_idx[winners]] = overlap_pcts[winners]
+    best_regions[boundary_idx[winners]] = region_idx[winners]
+    
+    # Missing (None) or empty rows are treated like zero-area boundaries:
+    # 0 hectares and 0 projections instead of NaN and overflowed casts
+    no_geometry = shapely.is_missing(boundaries) | shapely.is_empty(boundaries)
+    area_hectares = np.zeros(n)
+    area_hectares[~no_geometry] = equal_area_hectares(boundaries[~no_geometry])
+    projections = project_outputs(area_hectares)
+    
+    # Plain Python values matching analyze_land: float overlap, or int 0
+    # and no region when nothing overlaps
+    return [
+        build_plan(
+            BIOGEO_REGION_NAMES[region] if overlap > 0 else None,
+            overlap if overlap > 0 else 0,
+            area,
+            projections[i],
+        )
+        for i, (region, overlap, area) in enumerate(zip(
+            best_regions.tolist(), max_overlaps.tolist(), area_hectares.tolist()))
+    ]
+
+# FIXED: Remove emojis for Windows compatibility
+# Bound str.format_map of the report body, created once per process
+_REPORT_TMPL = """CLIMATECHIC RESTORATION PLAN
 ==================================================
-Region: {plan['biogeographic_region']}
-Area: {plan['simulation']['land_area_hectares']} hectares
-Region Overlap: {plan['simulation']['region_overlap_percentage']}%
+Region: {biogeographic_region}
+Area: {land_area_hectares} hectares
+Region Overlap: {region_overlap_percentage}%
 
 RECOMMENDED FLORA:
-"""
-    for flora in plan['recommended_flora']:
-        report += f"* {flora['name']} ({flora['type']}) - {flora['chicken_benefit']}\n"
-    
-    report += f"""
+{flora_lines}
 PROJECTIONS:
-* Trees (Year 5): {plan['simulation']['estimated_trees_year_5']}
-* Chickens (Year 2): {plan['simulation']['estimated_chickens_year_2']}
-* BSF Production: {plan['simulation']['black_soldier_fly_production_kg_week']} kg/week
+* Trees (Year 5): {estimated_trees_year_5}
+* Chickens (Year 2): {estimated_chickens_year_2}
+* BSF Production: {black_soldier_fly_production_kg_week} kg/week
 
 OPERATIONAL GUIDELINES:
 * Months 1-3: Soil preparation and pioneer species planting
 * Months 4-6: Introduce nitrogen-fixing plants and cover crops
 * Months 7-12: Establish poultry infrastructure and initial flock
 * Year 2: Scale integrated systems and value-added production
-"""
-    return report
+""".format_map
+
+def generate_plan_report(plan):
+    """Generate restoration plan report."""
+    return _REPORT_TMPL({
+        **plan,
+        **plan['simulation'],
+        'flora_lines': _FLORA_LINES.get(plan['biogeographic_region'], ''),
+    })
 
 # ==============================================
 # 3. BOUNDARY PROCESSING FUNCTIONS
 # ==============================================
 
+def read_boundary_geojson(geojson_path):
+    """Read the lon/lat geometries of a boundary GeoJSON as a shapely array."""
+    data = orjson.loads(Path(geojson_path).read_bytes())
+    # Accept a FeatureCollection, a single Feature or a bare geometry
+    if data.get('type') == 'FeatureCollection':
+        features = data['features']
+    elif data.get('type') == 'Feature':
+        features = [data]
+    else:
+        features = [{'geometry': data}]
+    geoms = [shape(f['geometry']) for f in features if f.get('geometry')]
+    return np.array(geoms, dtype=object)
+
 def process_geojson_file(geojson_path):
     """Process a GeoJSON file and generate analysis."""
     try:
         print(f"Processing: {geojson_path}")
-        boundary_gdf = gpd.read_file(geojson_path)
-        restoration_plan = analyze_land(boundary_gdf)
+        boundary_geom = union_geometries(read_boundary_geojson(geojson_path))
+        restoration_plan = analyze_land(boundary_geom)
         report = generate_plan_report(restoration_plan)
         
         # Save report to text file with UTF-8 encoding for Windows
-        report_filename = geojson_path.replace('.geojson', '_report.txt')
-        with open(report_filename, 'w', encoding='utf-8') as f:
-            f.write(report)
+        geojson_file = Path(geojson_path)
+        report_path = geojson_file.with_name(geojson_file.stem + '_report.txt')
+        report_path.write_text(report, encoding='utf-8')
+        # Machine-readable copy of the plan alongside the text report
+        plan_path = report_path.with_suffix('.json')
+        plan_path.write_bytes(orjson.dumps(
+            restoration_plan, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
         
-        print(f"Analysis complete! Report saved: {report_filename}")
+        print(f"Analysis complete! Report saved: {report_path}")
+        print(f"Plan data saved: {plan_path}")
         print("\n" + "="*50)
         print(report)
         print("="*50)
@@ -130,9 +308,14 @@ def process_geojson_file(geojson_path):
         import traceback
         traceback.print_exc()
 
-def create_interactive_map():
-    """Create map with drawing tools."""
-    m = folium.Map(location=[-1.225, 36.775], zoom_start=12)
+def build_drawing_tool_template():
+    """Render the folium drawing tool once and save it as an HTML template."""
+    import folium
+    from folium import plugins
+    
+    # Sentinel coordinates, swapped for placeholders after rendering
+    lat, lon = _TEMPLATE_SENTINEL
+    m = folium.Map(location=[lat, lon], zoom_start=12)
     
     # Add basemaps
     folium.TileLayer(
@@ -193,14 +376,33 @@ def create_interactive_map():
     '''
     
     folium.Marker(
-        [-1.225, 36.775],
+        [lat, lon],
         icon=folium.DivIcon(html='<div style="font-size: 24px; color: green;">!</div>'),
         popup=folium.Popup(instructions, max_width=300)
     ).add_to(m)
     
-    m.save('climatechic_drawing_tool.html')
+    html = m.get_root().render()
+    html = html.replace(repr(lat), '{{ lat }}').replace(repr(lon), '{{ lon }}')
+    DRAWING_TOOL_TEMPLATE.write_text(html, encoding='utf-8')
+    _drawing_tool_template.cache_clear()
+    return html
+
+@lru_cache(maxsize=None)
+def _drawing_tool_template():
+    """Load the drawing tool template, building it with folium if missing."""
+    if not DRAWING_TOOL_TEMPLATE.exists():
+        return build_drawing_tool_template()
+    return DRAWING_TOOL_TEMPLATE.read_text(encoding='utf-8')
+
+def create_interactive_map(location=DEFAULT_LOCATION):
+    """Create map with drawing tools."""
+    lat, lon = location
+    html = _drawing_tool_template().replace('{{ lat }}', repr(float(lat)))
+    html = html.replace('{{ lon }}', repr(float(lon)))
+    
+    Path('climatechic_drawing_tool.html').write_text(html, encoding='utf-8')
     print("Drawing tool created: climatechic_drawing_tool.html")
-    return m
+    return html
 
 # ==============================================
 # 4. MAIN EXECUTION
@@ -1,12 +1,9 @@
 # climatechic_simple.py
-import geopandas as gpd
-from shapely.geometry import Polygon
 import webbrowser
-import os
+from pathlib import Path
 
-def create_simple_map():
-    """Create a simple HTML map with drawing tools"""
-    html_content = """
+# Page is static, so keep it as pre-encoded bytes and write it as-is
+SIMPLE_MAP_HTML = b"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -22,13 +19,16 @@ def create_simple_map():
     <div id="map"></div>
     <div class="info">
         <h3>Draw your farm boundary</h3>
-        <p>Right-click → Save as GeoJSON</p>
+        <p>Right-click &rarr; Save as GeoJSON</p>
         <p>Then run: python analyze.py your_file.geojson</p>
     </div>
     
     <script>
-        const map = L.map('map').setView([-1.286, 36.817], 12);
-        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png').addTo(map);
+        const map = L.map('map', {preferCanvas: true}).setView([-1.286, 36.817], 12);
+        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+            updateWhenIdle: true,
+            keepBuffer: 4
+        }).addTo(map);
         
         let drawnItems = new L.FeatureGroup();
         map.addLayer(drawnItems);
@@ -60,10 +60,11 @@ def create_simple_map():
     </script>
 </body>
 </html>
-    """
-    
-    with open('simple_map.html', 'w') as f:
-        f.write(html_content)
+"""
+
+def create_simple_map():
+    """Create a simple HTML map with drawing tools"""
+    Path('simple_map.html').write_bytes(SIMPLE_MAP_HTML)
     
     webbrowser.open('simple_map.html')
 